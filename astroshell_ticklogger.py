@@ -31,6 +31,12 @@ Weather JSON (tmpfs):   /home/aagsolo/aag_json.dat (created by Solo)
 Note: The Solo has a read-only root filesystem to protect the SD card.
       /home/aagsolo is a tmpfs (RAM disk) - data is lost on reboot.
       Periodic backup to Synology NAS via SCP preserves data.
+      CSV writes are buffered and never fsync'd (CSV_ON_TMPFS) - fsync
+      on a RAM disk buys no durability.
+
+Keep this a single pure-Python, stdlib-only file: it is installed by
+pasting into vi on the read-only Solo, which has no pip or C toolchain,
+so compiled extensions (Cython etc.) and third-party packages are out.
 
 Synology Backup (one-time SSH key setup on Solo as root):
       1. ssh-keygen -t rsa -N "" -f ~/.ssh/id_rsa
@@ -92,6 +98,11 @@ Status:     systemctl status astroshell_ticklogger
 Logs:       journalctl -u astroshell_ticklogger -f
 Disable:    mount -o remount,rw / && systemctl disable astroshell_ticklogger && mount -o remount,ro /
 
+Per-request logging (every CSV row and HTTP request) is off by default to
+keep journald writes off the request path. Startup, events and errors are
+always logged. To enable, add under [Service]:
+            Environment=ASTROSHELL_DEBUG=1
+
 ==============================================================================
 TESTING
 ==============================================================================
@@ -120,7 +131,8 @@ GET /log?m=<motor>&d=<direction>&t=<ticks>&temp=<C>&tof=<cm>
     t: Tick count from Arduino ISR (~61 ticks/second)
     temp: Arduino DS18B20 temperature in C (optional, -999 = unavailable)
     tof: Arduino VL53L0X distance in cm (optional, -1 = unavailable)
-    Returns: "OK" or "ERROR"
+    Returns: "OK" or "ERROR" (400 if m, d or t is missing or out of range,
+             or temp/tof is not a number)
 
 GET /interrupt?m=<motor>&d=<direction>&t=<ticks>&temp=<C>&tof=<cm>
     Logs interrupted stop (motor stopped before reaching target limit).
@@ -149,6 +161,10 @@ timestamp_utc,motor,direction,ticks,temperature,arduino_temp,tof_cm
 2026-02-03T18:30:45Z,1,closing,5234,18.5,18.3,7.3
 2026-02-03T18:35:12Z,1,opening,5456,-0.9,-1.0,7.2
 
+Plain CSV on purpose: the Synology backups are analysed directly (see
+motor_analysis_v9_findings.txt). A few dozen rows per night don't justify a
+binary record format plus a separate export step.
+
 ==============================================================================
 EVENT TYPES (Pushover notifications)
 ==============================================================================
@@ -162,20 +178,32 @@ conflict        — Limit switch vs ToF disagreement
 """
 
 import os
-import json
+import sys
+import logging
+import atexit
+import signal
+import time
+from collections import deque
 import subprocess
 import threading
 import urllib.request
 import urllib.parse
 from datetime import datetime, timezone
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
 
 # --- Configuration ---
 SERVER_PORT = 88
 CSV_FILE = "/home/aagsolo/motor_ticks.csv"
+CSV_ON_TMPFS = True  # RAM disk: never fsync, durability comes from the Synology backup
 AAG_JSON_FILE = "/home/aagsolo/aag_json.dat"  # Cloudwatcher Solo weather data (read-only)
 
+# Per-request lines (tick rows, HTTP access log) only with ASTROSHELL_DEBUG=1;
+# startup, events and errors always reach journald
+DEBUG = os.environ.get("ASTROSHELL_DEBUG") == "1"
+log = logging.getLogger("ticklogger")
+
 # --- Synology Backup Configuration ---
 SYNOLOGY_ENABLED = True
 SYNOLOGY_HOST = "192.168.1.113"
@@ -204,10 +232,59 @@ PUSHOVER_SOUNDS = {
     "frozen_lockout": "siren",  # Urgent attention needed
 }
 
+MOTORS = ("1", "2")
+MAX_TICKS = 100000  # Far above the 6527-tick motor timeout - anything larger is garbage
+
+# Direction code from Arduino -> CSV direction string
+DIR_MAP = {"1": "closing", "2": "opening"}
+DIR_MAP_INT = {"1": "INTERRUPTED-closing", "2": "INTERRUPTED-opening"}
+
+# Persistent CSV append handle, opened once in main() (avoids open/close per tick)
+CSV_FP = None
+CSV_BUFFER_SIZE = 4096     # Bytes - holds ~60 rows, one write() per flush
+CSV_FLUSH_EVERY = 16       # Flush after this many pending rows...
+CSV_FLUSH_INTERVAL = 1.0   # ...or this many seconds after the first pending row
+_csv_pending = deque()     # Rows not yet handed to CSV_FP (guarded by csv_lock)
+_csv_flush_timer = None
+
+# Serializes CSV appends - handlers run in parallel threads (ThreadingHTTPServer)
+csv_lock = threading.Lock()
+
+# Cached Solo temperature, invalidated when aag_json.dat mtime changes
+# (Solo rewrites the file every few seconds, Arduino requests arrive in bursts)
+_temp_cache = {"mtime": 0, "value": -999}
+
+# Process-lifetime read handle on aag_json.dat (opened lazily - the Solo may
+# not have created the file yet at startup). Reopened when the inode changes,
+# i.e. the Solo replaced the file instead of rewriting it in place.
+_aag_fd = None
+_aag_ino = None
+_aag_lock = threading.Lock()
+
+def _read_aag_json(st):
+    """Reads up to 4 KB of aag_json.dat via pread on the held descriptor."""
+    global _aag_fd, _aag_ino
+    with _aag_lock:
+        try:
+            if _aag_fd is None or st.st_ino != _aag_ino:
+                if _aag_fd is not None:
+                    os.close(_aag_fd)
+                    _aag_fd = None
+                _aag_fd = os.open(AAG_JSON_FILE, os.O_RDONLY)
+                _aag_ino = os.fstat(_aag_fd).st_ino
+            return os.pread(_aag_fd, 4096, 0)
+        except OSError:
+            # ENOENT/EIO etc: drop the handle so the next read reopens
+            if _aag_fd is not None:
+                os.close(_aag_fd)
+                _aag_fd = None
+            raise
+
 def get_solo_temperature():
     """
     Reads ambient temperature from Cloudwatcher Solo's aag_json.dat file.
     Returns temperature in Celsius or -999 if unavailable.
+    Parsed value is cached until the file's mtime changes.
 
     JSON structure:
     {
@@ -217,85 +294,137 @@ def get_solo_temperature():
     }
     """
     try:
-        with open(AAG_JSON_FILE, 'r') as f:
-            data = json.load(f)
-        temp = data.get('temp')
-        if temp is not None:
-            return round(float(temp), 1)
-    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError) as e:
-        print(f"Temperature read error: {e}")
+        st = os.stat(AAG_JSON_FILE)
+        if st.st_mtime_ns == _temp_cache["mtime"]:
+            return _temp_cache["value"]
+
+        buf = _read_aag_json(st)
+
+        # Scan for the "temp" field directly instead of json.load() - the file
+        # has a fixed flat schema and only this one value is needed
+        i = buf.find(b'"temp"')
+        if i < 0:
+            raise KeyError('temp')
+        j = buf.find(b':', i)
+        if j < 0:
+            raise ValueError("no ':' after \"temp\"")
+        j += 1
+        k = buf.find(b',', j)
+        if k < 0:
+            k = buf.find(b'}', j)
+        if k < 0:
+            raise ValueError("unterminated \"temp\" value (partial write?)")
+        value = round(float(buf[j:k].strip()), 1)
+        _temp_cache.update(mtime=st.st_mtime_ns, value=value)
+        return value
+    except (OSError, KeyError, ValueError) as e:
+        log.warning("Temperature read error: %s", e)
+    _temp_cache.update(mtime=0, value=-999)  # Force re-read on next request
     return -999  # Fallback value indicates "not available"
 
+# Last formatted timestamp as (epoch second, string) - several rows per second
+# during a dome move reuse it
+_last_timestamp = (0, "")
+
+def utc_iso_now():
+    """Returns the current UTC time as 'YYYY-MM-DDTHH:MM:SSZ' (CSV timestamp)."""
+    global _last_timestamp
+    now = int(time.time())
+    cached = _last_timestamp
+    if now == cached[0]:
+        return cached[1]
+    g = time.gmtime(now)
+    stamp = (f"{g.tm_year:04d}-{g.tm_mon:02d}-{g.tm_mday:02d}"
+             f"T{g.tm_hour:02d}:{g.tm_min:02d}:{g.tm_sec:02d}Z")
+    _last_timestamp = (now, stamp)
+    return stamp
+
 def ensure_csv_header():
     """Creates CSV file with header if it doesn't exist (v4.0 format)."""
     if not os.path.exists(CSV_FILE):
-        with open(CSV_FILE, 'w') as f:
-            f.write("timestamp_utc,motor,direction,ticks,temperature,arduino_temp,tof_cm\n")
-        print(f"Created new CSV file: {CSV_FILE}")
+        with open(CSV_FILE, 'wb') as f:
+            f.write(b"timestamp_utc,motor,direction,ticks,temperature,arduino_temp,tof_cm\n")
+        log.info("Created new CSV file: %s", CSV_FILE)
+
+def _flush_csv_locked():
+    """Writes pending CSV rows to disk in one write(). Caller must hold csv_lock."""
+    global _csv_flush_timer
+    if _csv_flush_timer is not None:
+        _csv_flush_timer.cancel()
+        _csv_flush_timer = None
+    if _csv_pending:
+        CSV_FP.write(b"".join(_csv_pending))
+        _csv_pending.clear()
+        CSV_FP.flush()
+        if not CSV_ON_TMPFS:
+            os.fsync(CSV_FP.fileno())  # Only worth the cost on real storage
+        return True
+    return False
 
-def log_tick_data(motor, direction, ticks, arduino_temp=None, tof_cm=None):
+def flush_csv():
     """
-    Logs a single tick measurement to CSV.
-
-    Args:
-        motor: 1 or 2
-        direction: 1 (closing/open->close) or 2 (opening/close->open)
-        ticks: ISR tick count (~61 ticks/second)
-        arduino_temp: Temperature from Arduino DS18B20 (string, optional)
-        tof_cm: ToF distance from Arduino VL53L0X in cm (string, optional)
+    Flushes buffered CSV rows and backs up the file to the NAS.
+    Called from the flush timer thread and on shutdown.
     """
-    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-    temperature = get_solo_temperature()
-
-    # Direction as readable string for CSV
-    dir_str = "closing" if direction == "1" else "opening"
-
-    # Arduino-reported values (use empty string if not provided)
-    a_temp = arduino_temp if arduino_temp else ""
-    a_tof = tof_cm if tof_cm else ""
-
-    line = f"{timestamp},{motor},{dir_str},{ticks},{temperature},{a_temp},{a_tof}\n"
-
     try:
-        with open(CSV_FILE, 'a') as f:
-            f.write(line)
-        print(f"Logged: M{motor} {dir_str} {ticks} ticks @ {temperature}C (Arduino: {a_temp}C, ToF: {a_tof}cm)")
-        backup_to_synology()  # Sync to NAS after each record
-        return True
-    except IOError as e:
-        print(f"CSV write error: {e}")
-        return False
-
-def log_interrupt_data(motor, direction, ticks, arduino_temp=None, tof_cm=None):
+        with csv_lock:
+            flushed = _flush_csv_locked()
+        if flushed:
+            backup_to_synology()  # Sync to NAS after each flush
+    except (IOError, ValueError) as e:  # ValueError: handle already closed
+        log.error("CSV flush error: %s", e)
+
+def write_csv_row(line):
+    """
+    Queues one CSV row (bytes).
+    Rows reach disk every CSV_FLUSH_EVERY rows or CSV_FLUSH_INTERVAL seconds,
+    so a burst of tick reports during dome movement costs one write() syscall.
+    """
+    global _csv_flush_timer
+    with csv_lock:
+        _csv_pending.append(line)
+        flushed = len(_csv_pending) >= CSV_FLUSH_EVERY and _flush_csv_locked()
+        if not flushed and _csv_flush_timer is None:
+            _csv_flush_timer = threading.Timer(CSV_FLUSH_INTERVAL, flush_csv)
+            _csv_flush_timer.daemon = True
+            _csv_flush_timer.start()
+    if flushed:
+        backup_to_synology()  # Sync to NAS after each flush
+
+def log_tick_data(motor, direction, ticks, arduino_temp=None, tof_cm=None, interrupted=False):
     """
-    Logs an interrupted stop to CSV (motor stopped before reaching target).
+    Logs a single tick measurement to CSV.
 
     Args:
         motor: 1 or 2
-        direction: 1 (was closing) or 2 (was opening)
-        ticks: ISR tick count at interruption
+        direction: 1 (closing/open->close) or 2 (opening/close->open)
+        ticks: ISR tick count (~61 ticks/second), or count at interruption
         arduino_temp: Temperature from Arduino DS18B20 (string, optional)
         tof_cm: ToF distance from Arduino VL53L0X in cm (string, optional)
+        interrupted: True if the motor stopped before reaching its target
+                     limit (direction gets the INTERRUPTED marker)
     """
-    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    timestamp = utc_iso_now()
     temperature = get_solo_temperature()
 
-    # Direction with INTERRUPTED marker
-    dir_str = "INTERRUPTED-closing" if direction == "1" else "INTERRUPTED-opening"
+    # Direction as readable string for CSV (validated by the handler)
+    dir_str = (DIR_MAP_INT if interrupted else DIR_MAP)[direction]
 
+    # Arduino-reported values (use empty string if not provided)
     a_temp = arduino_temp if arduino_temp else ""
     a_tof = tof_cm if tof_cm else ""
 
-    line = f"{timestamp},{motor},{dir_str},{ticks},{temperature},{a_temp},{a_tof}\n"
+    # Encoded once here; CSV_FP is binary so there's no text-layer encode per write
+    line = f"{timestamp},{motor},{dir_str},{ticks},{temperature},{a_temp},{a_tof}\n".encode()
 
     try:
-        with open(CSV_FILE, 'a') as f:
-            f.write(line)
-        print(f"INTERRUPT: M{motor} {dir_str} at {ticks} ticks @ {temperature}C (Arduino: {a_temp}C, ToF: {a_tof}cm)")
-        backup_to_synology()  # Sync to NAS after each record
+        write_csv_row(line)
+        tag = "INTERRUPT" if interrupted else "Logged"
+        log.debug("%s: M%s %s %s ticks @ %sC (Arduino: %sC, ToF: %scm)",
+                  tag, motor, dir_str, ticks, temperature, a_temp, a_tof)
         return True
     except IOError as e:
-        print(f"CSV write error: {e}")
+        log.error("CSV write error: %s", e)
         return False
 
 def backup_to_synology():
@@ -323,13 +452,13 @@ def backup_to_synology():
                 timeout=30
             )
             if result.returncode == 0:
-                print(f"Backup: {remote_filename}")
+                log.debug("Backup: %s", remote_filename)
             else:
-                print(f"Backup: SCP failed - {result.stderr.decode().strip()}")
+                log.warning("Backup: SCP failed - %s", result.stderr.decode().strip())
         except subprocess.TimeoutExpired:
-            print("Backup: SCP timeout")
+            log.warning("Backup: SCP timeout")
         except Exception as e:
-            print(f"Backup: Error - {e}")
+            log.warning("Backup: Error - %s", e)
 
     thread = threading.Thread(target=_scp_worker, daemon=True)
     thread.start()
@@ -350,7 +479,7 @@ def send_pushover_event(event_type, detail, temp=None, tof=None):
 
     # Skip if using placeholder credentials
     if "JOHNDOE" in PUSHOVER_API_TOKEN or "JOHNDOE" in PUSHOVER_USER_KEY:
-        print(f"Pushover: Skipped (placeholder credentials) - {event_type}: {detail}")
+        log.info("Pushover: Skipped (placeholder credentials) - %s: %s", event_type, detail)
         return
 
     def _pushover_worker():
@@ -394,149 +523,221 @@ def send_pushover_event(event_type, detail, temp=None, tof=None):
             req = urllib.request.Request(PUSHOVER_API_URL, data=data)
             with urllib.request.urlopen(req, timeout=10) as resp:
                 if resp.status == 200:
-                    print(f"Pushover: Sent [{event_type}] {detail}")
+                    log.info("Pushover: Sent [%s] %s", event_type, detail)
                 else:
-                    print(f"Pushover: HTTP {resp.status} for [{event_type}]")
+                    log.warning("Pushover: HTTP %s for [%s]", resp.status, event_type)
         except Exception as e:
-            print(f"Pushover: Error - {e}")
+            log.error("Pushover: Error - %s", e)
 
     thread = threading.Thread(target=_pushover_worker, daemon=True)
     thread.start()
 
+# Keys the Arduino sends to /log and /interrupt (plain ASCII, never encoded)
+MDT_KEYS = frozenset(('m', 'd', 't', 'temp', 'tof'))
+
+def _parse_query(query):
+    """Parses a query string into a flat dict (first value per key)."""
+    return {k: v[0] for k, v in parse_qs(query).items()}
+
+def _fast_parse_mdt(query):
+    """
+    Hot-path query parser for /log and /interrupt.
+    Splits the fixed-format Arduino query directly instead of going through
+    parse_qs; falls back to _parse_query() for anything unexpected (unknown
+    keys, percent/plus encoding, missing '=').
+    """
+    if '%' not in query and '+' not in query:
+        params = dict(kv.split('=', 1) for kv in query.split('&') if '=' in kv)
+        if params.keys() <= MDT_KEYS and len(params) == query.count('&') + 1:
+            return params
+    return _parse_query(query)
+
+def _is_csv_number(value):
+    """True if an optional sensor value is empty or a plain number (safe as a CSV field)."""
+    if not value:
+        return True
+    if not value.isascii() or value != value.strip() or '_' in value:
+        return False  # float() would accept surrounding whitespace/newlines and 1_0
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+def _parse_mdt(params):
+    """
+    Extracts motor, direction and ticks from /log and /interrupt parameters.
+    Returns (motor, direction, ticks) or None if missing or invalid, so bad
+    requests are rejected before any temperature read or CSV write.
+    The optional temp and tof values must be empty or numeric, since they
+    are copied into the CSV row verbatim.
+    """
+    motor = params.get('m')
+    direction = params.get('d')
+    ticks = params.get('t')
+    if (motor in MOTORS and direction in DIR_MAP and ticks
+            and ticks.isascii() and ticks.isdigit() and int(ticks) < MAX_TICKS
+            and _is_csv_number(params.get('temp'))
+            and _is_csv_number(params.get('tof'))):
+        return motor, direction, ticks
+    return None
+
+def http_response(code, body):
+    """
+    Builds a complete plain-text HTTP/1.1 response (status line, headers, body).
+    Content-Length is always set so the connection can be kept alive.
+    """
+    head = (f"HTTP/1.1 {code} {HTTPStatus(code).phrase}\r\n"
+            f"Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+# Fixed responses, built once - sent with a single write() per request
+RESP_OK = http_response(200, b'OK')
+RESP_ERR = http_response(500, b'ERROR')
+RESP_400_MDT = http_response(400, b'Missing or invalid parameters (m=1|2, d=1|2, t=0..99999 required; temp, tof numeric)')
+RESP_400_TYPE = http_response(400, b'Missing parameter: type')
+RESP_404 = http_response(404, b'Not Found')
+RESP_STATUS = http_response(200, b'Tick Logger Running v4.0')
+
 class TickLoggerHandler(BaseHTTPRequestHandler):
     """HTTP request handler for tick logging and event notifications."""
 
+    # HTTP/1.1 keep-alive: a client may reuse one TCP connection across ticks.
+    # HTTP/1.0 clients and "Connection: close" requests still get closed.
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # Seconds - drop idle keep-alive connections (frees the thread)
+
     def log_message(self, format, *args):
-        """Override to customize logging."""
-        print(f"{self.address_string()} - {format % args}")
+        """Access log - debug only, skipped entirely in normal operation."""
+        if DEBUG:
+            log.debug("%s - %s", self.address_string(), format % args)
+
+    def log_error(self, format, *args):
+        """Malformed requests (e.g. unencoded spaces) are always logged."""
+        if format.startswith("Request timed out"):
+            return  # Idle keep-alive connection reaching `timeout` - expected
+        log.warning("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, resp):
+        """Sends a prebuilt response (see http_response) in one write."""
+        self.wfile.write(resp)
+        if DEBUG:
+            self.log_request(int(resp[9:12]))
+
+    def _do_log(self, query, interrupted=False):
+        """/log (and /interrupt): ?m=1&d=1&t=5234&temp=12.5&tof=7.3"""
+        params = _fast_parse_mdt(query)
+        mdt = _parse_mdt(params)
+        if mdt is None:
+            self._reply(RESP_400_MDT)
+            return
+        success = log_tick_data(*mdt, params.get('temp'), params.get('tof'), interrupted)
+        self._reply(RESP_OK if success else RESP_ERR)
+
+    def _do_interrupt(self, query):
+        """/interrupt: interrupted stop, same parameters as /log."""
+        self._do_log(query, interrupted=True)
+
+    def _do_event(self, query):
+        """/event: notification from Arduino - send Pushover alert."""
+        params = _parse_query(query)
+
+        event_type = params.get('type')
+        detail = params.get('detail', '')
+        temp = params.get('temp')
+        tof = params.get('tof')
+
+        if event_type:
+            log.info("EVENT: [%s] %s (temp=%s, tof=%s)", event_type, detail, temp, tof)
+            send_pushover_event(event_type, detail, temp, tof)
+            self._reply(RESP_OK)
+        else:
+            self._reply(RESP_400_TYPE)
+
+    def _do_env(self, query):
+        """/env: current temperature and coefficient for Arduino."""
+        temp = get_solo_temperature()
+        coeff = 1.0  # Fixed for now, later from analysis
+        self._reply(http_response(200, f"{temp},{coeff}".encode()))
+
+    def _do_status(self, query):
+        """/status: simple health check."""
+        self._reply(RESP_STATUS)
+
+    def _not_found(self, query):
+        self._reply(RESP_404)
+
+    # Path -> handler, looked up once per request instead of an if/elif chain.
+    # Exact-path dict lookup on purpose: first-character dispatch doesn't work
+    # here (/env and /event both start with 'e') and would send e.g. /logs to
+    # the /log handler instead of 404.
+    ROUTES = {
+        '/log': _do_log,
+        '/interrupt': _do_interrupt,
+        '/event': _do_event,
+        '/env': _do_env,
+        '/status': _do_status,
+    }
 
     def do_GET(self):
         """Handle GET requests from Arduino."""
-        parsed = urlparse(self.path)
-
-        if parsed.path == '/log':
-            # Parse query parameters: ?m=1&d=1&t=5234&temp=12.5&tof=7.3
-            params = parse_qs(parsed.query)
-
-            motor = params.get('m', [None])[0]
-            direction = params.get('d', [None])[0]
-            ticks = params.get('t', [None])[0]
-            arduino_temp = params.get('temp', [None])[0]
-            tof_cm = params.get('tof', [None])[0]
-
-            if motor and direction and ticks:
-                success = log_tick_data(motor, direction, ticks, arduino_temp, tof_cm)
-                self.send_response(200 if success else 500)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'OK' if success else b'ERROR')
-            else:
-                self.send_response(400)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing parameters (m, d, t required)')
-
-        elif parsed.path == '/interrupt':
-            # Parse query parameters for interrupted stop
-            params = parse_qs(parsed.query)
-
-            motor = params.get('m', [None])[0]
-            direction = params.get('d', [None])[0]
-            ticks = params.get('t', [None])[0]
-            arduino_temp = params.get('temp', [None])[0]
-            tof_cm = params.get('tof', [None])[0]
-
-            if motor and direction and ticks:
-                success = log_interrupt_data(motor, direction, ticks, arduino_temp, tof_cm)
-                self.send_response(200 if success else 500)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'OK' if success else b'ERROR')
-            else:
-                self.send_response(400)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing parameters (m, d, t required)')
-
-        elif parsed.path == '/event':
-            # Event notification from Arduino — send Pushover alert
-            params = parse_qs(parsed.query)
-
-            event_type = params.get('type', [None])[0]
-            detail = params.get('detail', [''])[0]
-            temp = params.get('temp', [None])[0]
-            tof = params.get('tof', [None])[0]
-
-            if event_type:
-                print(f"EVENT: [{event_type}] {detail} (temp={temp}, tof={tof})")
-                send_pushover_event(event_type, detail, temp, tof)
-
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'OK')
-            else:
-                self.send_response(400)
-                self.send_header('Content-Type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b'Missing parameter: type')
-
-        elif parsed.path == '/env':
-            # Return current temperature and coefficient for Arduino
-            temp = get_solo_temperature()
-            coeff = 1.0  # Fixed for now, later from analysis
-
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(f"{temp},{coeff}".encode())
-
-        elif parsed.path == '/status':
-            # Simple status check endpoint
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Tick Logger Running v4.0')
-
-        else:
-            self.send_response(404)
-            self.send_header('Content-Type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Not Found')
+        path, _, query = self.path.partition('?')
+        handler = self.ROUTES.get(path, TickLoggerHandler._not_found)
+        handler(self, query)
 
 def main():
     """Main entry point."""
-    print(f"=" * 50)
-    print(f"AstroShell Tick Logger & Event Server v4.0")
-    print(f"=" * 50)
-    print(f"Port: {SERVER_PORT}")
-    print(f"CSV:  {CSV_FILE}")
-    print(f"=" * 50)
+    logging.basicConfig(stream=sys.stdout, format="%(message)s",
+                        level=logging.DEBUG if DEBUG else logging.INFO)
+
+    log.info("=" * 50)
+    log.info("AstroShell Tick Logger & Event Server v4.0")
+    log.info("=" * 50)
+    log.info("Port: %s", SERVER_PORT)
+    log.info("CSV:  %s", CSV_FILE)
+    log.info("=" * 50)
 
     ensure_csv_header()
 
+    global CSV_FP
+    CSV_FP = open(CSV_FILE, 'ab', buffering=CSV_BUFFER_SIZE)
+    atexit.register(CSV_FP.close)
+    atexit.register(flush_csv)  # Runs before close (atexit is LIFO)
+
+    # systemctl stop sends SIGTERM - take the same clean path as Ctrl+C so
+    # buffered rows are flushed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
     # Test temperature fetch on startup
     temp = get_solo_temperature()
-    print(f"Current temperature: {temp}C")
+    log.info("Current temperature: %sC", temp)
 
     # Log Synology backup status
     if SYNOLOGY_ENABLED:
-        print(f"Backup: Syncing to {SYNOLOGY_USER}@{SYNOLOGY_HOST} after each record")
+        log.info("Backup: Syncing to %s@%s after each CSV flush", SYNOLOGY_USER, SYNOLOGY_HOST)
 
     # Log Pushover status
     if PUSHOVER_ENABLED:
         if "JOHNDOE" in PUSHOVER_API_TOKEN:
-            print("Pushover: DISABLED (placeholder credentials - replace JOHNDOE values)")
+            log.info("Pushover: DISABLED (placeholder credentials - replace JOHNDOE values)")
         else:
-            print("Pushover: ENABLED")
-
-    server = HTTPServer(('0.0.0.0', SERVER_PORT), TickLoggerHandler)
-    print(f"Server listening on port {SERVER_PORT}...")
+            log.info("Pushover: ENABLED")
+
+    # Threaded server: a slow /log append doesn't block /env or /status probes
+    # (daemon_threads is already True on ThreadingHTTPServer - no shutdown hang)
+    # Deliberately stdlib-only: aiohttp/aiofiles aren't installed on the Solo's
+    # read-only root fs, and a handful of requests per dome move doesn't need
+    # an event loop. Same reason for staying single-process (no SO_REUSEPORT
+    # workers): the CSV batch, its lock and the temperature cache live in this
+    # process, and the service runs under MemoryMax=50M.
+    server = ThreadingHTTPServer(('0.0.0.0', SERVER_PORT), TickLoggerHandler)
+    log.info("Server listening on port %s...", SERVER_PORT)
 
     try:
         server.serve_forever()
     except KeyboardInterrupt:
-        print("\nShutting down...")
+        log.info("Shutting down...")
         server.shutdown()
 
 if __name__ == '__main__':